@@ -0,0 +1,60 @@
+# In-process response cache for read-heavy list endpoints.
+# The API runs as a single uvicorn process (see Procfile), so invalidating here is enough to keep readers consistent with writes.
+import threading
+import time
+
+DEFAULT_TTL_SECONDS = 60
+MAX_ENTRIES = 512
+
+# Namespaces
+INSPECTION_LISTS = "inspection_lists"
+ROOMS = "rooms"  # Rooms and their prompts
+CODES = "codes"
+TOKENS = "tokens"  # Verified JWT payloads
+USERS = "users"  # The current-user response, by user id
+
+_lock = threading.Lock()
+_entries = {}
+_versions = {}
+
+# Keys carry the namespace version, so a response built before an invalidation can never be served after it
+def cache_key(namespace: str, *parts):
+    with _lock:
+        return (namespace, _versions.get(namespace, 0)) + parts
+
+def get_cached(key):
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del _entries[key]
+            return None
+        return value
+
+def set_cached(key, value, ttl: int = DEFAULT_TTL_SECONDS):
+    with _lock:
+        now = time.monotonic()
+        if len(_entries) >= MAX_ENTRIES:
+            for stale_key in [k for k, (expires_at, _) in _entries.items() if expires_at < now]:
+                del _entries[stale_key]
+        if len(_entries) >= MAX_ENTRIES:
+            # Still full, so drop the oldest entry
+            del _entries[next(iter(_entries))]
+        _entries[key] = (now + ttl, value)
+
+# Return the cached value for key, building and storing it on a miss; exceptions from build are not cached
+def get_or_set(key, build, ttl: int = DEFAULT_TTL_SECONDS):
+    value = get_cached(key)
+    if value is None:
+        value = build()
+        set_cached(key, value, ttl)
+    return value
+
+# Drop every cached response in a namespace; call after committing a write that changes it
+def invalidate(namespace: str):
+    with _lock:
+        _versions[namespace] = _versions.get(namespace, 0) + 1
+        for key in [k for k in _entries if k[0] == namespace]:
+            del _entries[key]
@@ -9,3 +9,6 @@ DEADLINE_OPTIONS = [
 ]
 
 DEADLINE_VALUES = [0, 1, 3, 7, 14, 30]
+
+# Days allowed for each deadline option, looked up once per violation instead of searching the option list
+DEADLINE_DAYS = dict(zip(DEADLINE_OPTIONS, DEADLINE_VALUES))
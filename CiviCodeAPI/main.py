@@ -1,7 +1,9 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from routes import addresses_router, users_router, businesses_router, contacts_router, violations_router, comments_router, citations_router, inspections_router, codes_router, licenses_router
+from routes.inspections import blob_service_client
 from database import engine, Base
 import uvicorn
 
@@ -12,9 +14,11 @@ async def lifespan(app: FastAPI):
     print("App startup event")
     yield  # This will allow the app to run
     # Shutdown logic
+    await blob_service_client.close()
     print("App shutdown event")
 
-app = FastAPI(lifespan=lifespan)
+# orjson serializes responses in C, well ahead of the stdlib json encoder on large lists
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Create all the tables in the database (make sure models are imported)
 Base.metadata.create_all(bind=engine)
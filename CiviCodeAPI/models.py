@@ -1,13 +1,13 @@
-from sqlalchemy import Column, Integer, String, Boolean, Float, DateTime, ForeignKey, Text, BigInteger, Date, func
+from sqlalchemy import Column, Integer, String, Boolean, Float, DateTime, ForeignKey, Text, BigInteger, Date, Index, func
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime, timedelta
 try:
     # If running normally (e.g., FastAPI server)
-    from constants import DEADLINE_OPTIONS, DEADLINE_VALUES
+    from constants import DEADLINE_DAYS
 except ImportError:
     # If running in Alembic context
-    from .constants import DEADLINE_OPTIONS, DEADLINE_VALUES
+    from .constants import DEADLINE_DAYS
 
 
 Base = declarative_base()
@@ -21,7 +21,12 @@ class ActiveStorageAttachment(Base):
     record_type = Column(String, nullable=False)
     record_id = Column(BigInteger, nullable=False)
     blob_id = Column(BigInteger, nullable=False)
-    created_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # Attachments are always looked up by their owning record and attachment name
+        Index('ix_active_storage_attachments_record', record_type, record_id, name),
+    )
 
 # ActiveStorageBlobs
 class ActiveStorageBlob(Base):
@@ -35,7 +40,7 @@ class ActiveStorageBlob(Base):
     service_name = Column(String, nullable=False)
     byte_size = Column(BigInteger, nullable=False)
     checksum = Column(String)
-    created_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
 
 # ActiveStorageVariantRecords
 class ActiveStorageVariantRecord(Base):
@@ -80,6 +85,11 @@ class Address(Base):
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, nullable=False, onupdate=func.now(), server_default=func.now())
 
+    __table_args__ = (
+        # Backs the map viewport filter on the address list
+        Index('ix_addresses_latitude_longitude', latitude, longitude),
+    )
+
     # Relationships
     inspections = relationship("Inspection", back_populates="address")  # Address has many Inspections
     comments = relationship("Comment", back_populates="address", cascade="all, delete-orphan") # Address has many Comments
@@ -105,23 +115,30 @@ class Area(Base):
     name = Column(String)
     notes = Column(Text)
     photos = Column(String)
-    inspection_id = Column(BigInteger, ForeignKey('inspections.id'), nullable=False)
+    inspection_id = Column(BigInteger, ForeignKey('inspections.id', ondelete='CASCADE'), nullable=False)
     floor = Column(Integer)
     unit_id = Column(BigInteger, ForeignKey('units.id'))
     created_at = Column(DateTime, default=func.now(), nullable=False)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
 
+    __table_args__ = (
+        # Serves per-unit area lookups and counts; inspection_id leads, so it also covers the foreign key
+        Index('ix_areas_inspection_id_unit_id', inspection_id, unit_id),
+        # Serves an inspection's area list in created_at order without a sort
+        Index('ix_areas_inspection_id_created_at', inspection_id, created_at.desc()),
+    )
+
     # Relationships
     inspection = relationship("Inspection", back_populates="areas")  # Define relationship to Inspections
     unit = relationship("Unit", back_populates="areas")  # Define relationship to Units
-    observations = relationship("Observation", back_populates="area", cascade="all, delete-orphan")  # Area has many Observations
+    observations = relationship("Observation", back_populates="area", cascade="all, delete-orphan", passive_deletes=True)  # Area has many Observations
 
 # AreaCodes
 class AreaCode(Base):
     __tablename__ = "area_codes"
 
     id = Column(BigInteger, primary_key=True, index=True)
-    area_id = Column(BigInteger, ForeignKey('areas.id'), nullable=False)
+    area_id = Column(BigInteger, ForeignKey('areas.id', ondelete='CASCADE'), nullable=False, index=True)
     code_id = Column(BigInteger, ForeignKey('codes.id'), nullable=False)
     created_at = Column(DateTime, default=func.now(), nullable=False)  # Auto-generate created_at timestamp
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)  # Auto-update updated_at timestamp
@@ -163,7 +180,7 @@ class Citation(Base):
     id = Column(BigInteger, primary_key=True, index=True)
     fine = Column(Integer)
     deadline = Column(Date)
-    violation_id = Column(BigInteger, ForeignKey('violations.id'), nullable=False)
+    violation_id = Column(BigInteger, ForeignKey('violations.id', ondelete='CASCADE'), nullable=False, index=True)
     created_at = Column(DateTime, default=func.now(), nullable=False)  # Auto-generate created_at timestamp
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)  # Auto-update updated_at timestamp
 
@@ -174,6 +191,11 @@ class Citation(Base):
     citationid = Column(String)
     unit_id = Column(BigInteger, ForeignKey('units.id'))
 
+    __table_args__ = (
+        # Lets the paged, newest-first citation list stop at the limit instead of sorting every row
+        Index('ix_citations_created_at', created_at.desc()),
+    )
+
     # Relationships
     violation = relationship("Violation", back_populates="citations") # Citation belongs to a Violation
     # citation has one code 
@@ -183,7 +205,7 @@ class Citation(Base):
 class CitationCode(Base):
     __tablename__ = "citations_codes"
     
-    citation_id = Column(BigInteger, ForeignKey('citations.id'), primary_key=True, nullable=False)
+    citation_id = Column(BigInteger, ForeignKey('citations.id', ondelete='CASCADE'), primary_key=True, nullable=False)
     code_id = Column(BigInteger, ForeignKey('codes.id'), primary_key=True, nullable=False)
 
 
@@ -193,7 +215,7 @@ class CitationComment(Base):
 
     id = Column(BigInteger, primary_key=True, index=True)
     user_id = Column(BigInteger, ForeignKey('users.id'), nullable=False)
-    citation_id = Column(BigInteger, ForeignKey('citations.id'), nullable=False)
+    citation_id = Column(BigInteger, ForeignKey('citations.id', ondelete='CASCADE'), nullable=False, index=True)
     content = Column(Text)
     created_at = Column(DateTime, default=func.now(), nullable=False)  # Auto-generate created_at timestamp
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)  # Auto-update updated_at timestamp
@@ -226,6 +248,11 @@ class Comment(Base):
     created_at = Column(DateTime, default=func.now(), nullable=False)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
 
+    __table_args__ = (
+        # Newest-first comments for an address without a sort
+        Index('ix_comments_address_id_created_at', address_id, created_at.desc()),
+    )
+
     # Relationships
     address = relationship("Address", back_populates="comments")
     user = relationship("User", back_populates="comments")
@@ -281,6 +308,11 @@ class Unit(Base):
     created_at = Column(DateTime, default=func.now(), nullable=False)  # Auto-generate created_at timestamp
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)  # Auto-update updated_at timestamp
 
+    __table_args__ = (
+        # Newest-first units for an address without a sort
+        Index('ix_units_address_id_created_at', address_id, created_at.desc()),
+    )
+
     # Relationships
     areas = relationship("Area", back_populates="unit")  # Unit has many Areas
 
@@ -289,7 +321,7 @@ class InspectionCode(Base):
     __tablename__ = "inspection_codes"
     
     id = Column(BigInteger, primary_key=True, index=True)
-    inspection_id = Column(BigInteger, ForeignKey('inspections.id'), nullable=False)
+    inspection_id = Column(BigInteger, ForeignKey('inspections.id', ondelete='CASCADE'), nullable=False, index=True)
     code_id = Column(BigInteger, ForeignKey('codes.id'), nullable=False)
     created_at = Column(DateTime, default=func.now(), nullable=False)  # Auto-generate created_at timestamp
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)  # Auto-update updated_at timestamp
@@ -301,11 +333,16 @@ class InspectionComment(Base):
     
     id = Column(BigInteger, primary_key=True, index=True)
     user_id = Column(BigInteger, ForeignKey('users.id'), nullable=False)
-    inspection_id = Column(BigInteger, ForeignKey('inspections.id'), nullable=False)
+    inspection_id = Column(BigInteger, ForeignKey('inspections.id', ondelete='CASCADE'), nullable=False)
     content = Column(Text)
     created_at = Column(DateTime, default=func.now(), nullable=False)  # Auto-generate created_at timestamp
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)  # Auto-update updated_at timestamp
 
+    __table_args__ = (
+        # Newest-first comments for an inspection; inspection_id leads, so it also covers the foreign key
+        Index('ix_inspection_comments_inspection_id_created_at', inspection_id, created_at.desc()),
+    )
+
 
 # Inspections
 class Inspection(Base):
@@ -349,18 +386,27 @@ class Inspection(Base):
     start_time = Column(DateTime)
     paid = Column(Boolean, default=False, nullable=False)
 
+    __table_args__ = (
+        # Backs keyset pagination of the non-complaint inspection list
+        Index('ix_inspections_created_id', created_at.desc(), id.desc(), postgresql_where=(source != 'Complaint')),
+        # Same for the complaint list
+        Index('ix_inspections_complaints_created_id', created_at.desc(), id.desc(), postgresql_where=(source == 'Complaint')),
+        # Per-address inspection and complaint lists
+        Index('ix_inspections_address_id_source', address_id, source),
+    )
+
     # Relationships
     address = relationship("Address", back_populates="inspections")
     inspector = relationship("User", back_populates="inspections")
     contact = relationship("Contact", back_populates="inspections")
-    areas = relationship("Area", back_populates="inspection", cascade="all, delete-orphan")  # Inspection has many Areas
+    areas = relationship("Area", back_populates="inspection", cascade="all, delete-orphan", passive_deletes=True)  # Inspection has many Areas
 
 # Licenses
 class License(Base):
     __tablename__ = "licenses"
     
     id = Column(BigInteger, primary_key=True, index=True)
-    inspection_id = Column(BigInteger, ForeignKey('inspections.id'), nullable=False)
+    inspection_id = Column(BigInteger, ForeignKey('inspections.id', ondelete='CASCADE'), nullable=False, index=True)
     sent = Column(Boolean)
     revoked = Column(Boolean)
     fiscal_year = Column(String)
@@ -374,6 +420,11 @@ class License(Base):
     created_at = Column(DateTime, default=func.now(), nullable=False)  # Auto-generate created_at timestamp
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)  # Auto-update updated_at timestamp
 
+    __table_args__ = (
+        # Backs keyset pagination of the license list
+        Index('ix_licenses_created_id', created_at.desc(), id.desc()),
+    )
+
 
 # Notifications
 class Notification(Base):
@@ -382,7 +433,7 @@ class Notification(Base):
     id = Column(BigInteger, primary_key=True, index=True)
     title = Column(String)
     body = Column(Text)
-    inspection_id = Column(BigInteger, ForeignKey('inspections.id'), nullable=False)
+    inspection_id = Column(BigInteger, ForeignKey('inspections.id', ondelete='CASCADE'), nullable=False, index=True)
     user_id = Column(BigInteger, ForeignKey('users.id'), nullable=False)
     read = Column(Boolean, default=False)
     created_at = Column(DateTime, default=func.now(), nullable=False)  # Auto-generate created_at timestamp
@@ -395,7 +446,7 @@ class Observation(Base):
     
     id = Column(BigInteger, primary_key=True, index=True)
     content = Column(Text)
-    area_id = Column(BigInteger, ForeignKey('areas.id'), nullable=False)
+    area_id = Column(BigInteger, ForeignKey('areas.id', ondelete='CASCADE'), nullable=False, index=True)
     photos = Column(String)
     potentialvio = Column(Boolean)
     user_id = Column(BigInteger, ForeignKey('users.id'), nullable=False)
@@ -405,7 +456,7 @@ class Observation(Base):
     # Relationships
     area = relationship("Area", back_populates="observations")  # Observation belongs to an Area
     user = relationship("User", back_populates="observations")  # Observation belongs to a User
-    photos = relationship("Photo", back_populates="observation", cascade="all, delete-orphan")  # Observation has many Photos
+    photos = relationship("Photo", back_populates="observation", cascade="all, delete-orphan", passive_deletes=True)  # Observation has many Photos
 
 # Photos
 class Photo(Base):
@@ -413,7 +464,7 @@ class Photo(Base):
     
     id = Column(BigInteger, primary_key=True, index=True)
     url = Column(String, nullable=False)
-    observation_id = Column(BigInteger, ForeignKey('observations.id'), nullable=False)
+    observation_id = Column(BigInteger, ForeignKey('observations.id', ondelete='CASCADE'), nullable=False, index=True)
     created_at = Column(DateTime, default=func.now(), nullable=False)  # Auto-generate created_at timestamp
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)  # Auto-update updated
 
@@ -426,7 +477,7 @@ class Prompt(Base):
     
     id = Column(BigInteger, primary_key=True, index=True)
     content = Column(String)
-    room_id = Column(BigInteger, ForeignKey('rooms.id'), nullable=False)
+    room_id = Column(BigInteger, ForeignKey('rooms.id'), nullable=False, index=True)
     created_at = Column(DateTime, default=func.now(), nullable=False)  # Auto-generate created_at timestamp
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)  # Auto-update updated_at timestamp
 
@@ -495,7 +546,7 @@ class ViolationCode(Base):
     __tablename__ = "violation_codes"
     
     id = Column(BigInteger, primary_key=True, index=True)
-    violation_id = Column(BigInteger, ForeignKey('violations.id'), nullable=False)
+    violation_id = Column(BigInteger, ForeignKey('violations.id', ondelete='CASCADE'), nullable=False, index=True)
     code_id = Column(BigInteger, ForeignKey('codes.id'), nullable=False)
     created_at = Column(DateTime, default=func.now(), nullable=False)  # Auto-generate created_at timestamp
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)  # Auto-update updated_at timestamp
@@ -506,7 +557,7 @@ class ViolationComment(Base):
     __tablename__ = "violation_comments"
     
     id = Column(BigInteger, primary_key=True, index=True)
-    violation_id = Column(BigInteger, ForeignKey('violations.id'), nullable=False)
+    violation_id = Column(BigInteger, ForeignKey('violations.id', ondelete='CASCADE'), nullable=False, index=True)
     user_id = Column(BigInteger, ForeignKey('users.id'), nullable=False)
     content = Column(Text)
     created_at = Column(DateTime, default=func.now(), nullable=False)  # Auto-generate created_at timestamp
@@ -520,38 +571,39 @@ class Violation(Base):
     id = Column(BigInteger, primary_key=True, index=True)
     description = Column(String)
     status = Column(Integer)
-    address_id = Column(BigInteger, ForeignKey('addresses.id'), nullable=False)
-    citations = relationship("Citation", backref="violation", cascade="all, delete-orphan")
+    address_id = Column(BigInteger, ForeignKey('addresses.id'), nullable=False, index=True)
     user_id = Column(BigInteger, ForeignKey('users.id'), nullable=False)
     deadline = Column(String)
     violation_type = Column(String)
     extend = Column(Integer, default=0)
     unit_id = Column(BigInteger, ForeignKey('units.id'))
-    inspection_id = Column(BigInteger, ForeignKey('inspections.id'))
+    inspection_id = Column(BigInteger, ForeignKey('inspections.id', ondelete='CASCADE'), index=True)
     comment = Column(Text)
     business_id = Column(BigInteger)
     created_at = Column(DateTime, default=func.now(), nullable=False)  # Auto-generate created_at timestamp
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)  # Auto-update updated_at timestamp
 
+    __table_args__ = (
+        # Lets the paged, newest-first violation list stop at the limit instead of sorting every row
+        Index('ix_violations_created_at', created_at.desc()),
+    )
 
     # Relationships
     address = relationship("Address", back_populates="violations") # Violation belongs to an Address
-    citations = relationship("Citation", back_populates="violation") # Violation has many Citations
+    citations = relationship("Citation", back_populates="violation", cascade="all, delete-orphan", passive_deletes=True) # Violation has many Citations
 
     def deadline_passed(self) -> bool:
         """Determine if the deadline has passed."""
-        deadline_index = DEADLINE_OPTIONS.index(self.deadline) if self.deadline in DEADLINE_OPTIONS else None
-        if deadline_index is None:
+        deadline_days = DEADLINE_DAYS.get(self.deadline)
+        if deadline_days is None:
             return False
-        deadline_days = DEADLINE_VALUES[deadline_index]
-        deadline_date = self.created_at + timedelta(days=deadline_days) + timedelta(days=self.extend)
+        deadline_date = self.created_at + timedelta(days=deadline_days + self.extend)
         return deadline_date < datetime.utcnow()
 
     @property
     def deadline_date(self) -> datetime:
         """Calculate the actual deadline date."""
-        deadline_index = DEADLINE_OPTIONS.index(self.deadline) if self.deadline in DEADLINE_OPTIONS else None
-        if deadline_index is None:
+        deadline_days = DEADLINE_DAYS.get(self.deadline)
+        if deadline_days is None:
             raise ValueError("Invalid deadline value")
-        deadline_days = DEADLINE_VALUES[deadline_index]
-        return self.created_at + timedelta(days=deadline_days) + timedelta(days=self.extend)
\ No newline at end of file
+        return self.created_at + timedelta(days=deadline_days + self.extend)
\ No newline at end of file
@@ -1,23 +1,46 @@
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import delete, update, inspect as sa_inspect
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import List, Optional
 from models import Address, Comment, Violation, Inspection, Unit
 from schemas import AddressCreate, AddressResponse, CommentResponse, ViolationResponse, InspectionResponse, ViolationCreate, CommentCreate, InspectionCreate, UnitResponse, UnitCreate
-from database import get_db  # Assuming a get_db function is set up to provide the database session
+from database import get_db, eager_options  # Assuming a get_db function is set up to provide the database session
+from cache import INSPECTION_LISTS, invalidate
 
 # Create a router instance
 router = APIRouter()
 
-# Get all addresses
+# Columns the address-scoped updates may write, read from the mappers once; the path already names the row, so never its id
+COMMENT_COLUMNS = frozenset(column.key for column in sa_inspect(Comment).mapper.column_attrs) - {"id"}
+VIOLATION_COLUMNS = frozenset(column.key for column in sa_inspect(Violation).mapper.column_attrs) - {"id"}
+
+# Get all addresses, optionally only those inside a map viewport
 @router.get("/addresses/", response_model=List[AddressResponse])
-def get_addresses(skip: int = 0, db: Session = Depends(get_db)):
-  addresses = db.query(Address).order_by(Address.id).offset(skip).all()
+def get_addresses(
+    skip: int = 0,
+    limit: Optional[int] = None,
+    min_lat: Optional[float] = None,
+    max_lat: Optional[float] = None,
+    min_lng: Optional[float] = None,
+    max_lng: Optional[float] = None,
+    db: Session = Depends(get_db)
+):
+  query = db.query(Address)
+  bbox = (min_lat, max_lat, min_lng, max_lng)
+  if any(value is not None for value in bbox):
+    if None in bbox:
+      raise HTTPException(status_code=400, detail="min_lat, max_lat, min_lng and max_lng must be provided together")
+    query = query.filter(
+      Address.latitude.between(min_lat, max_lat),
+      Address.longitude.between(min_lng, max_lng)
+    )
+  addresses = query.order_by(Address.id).offset(skip).limit(limit).all()
   return addresses
 
 # Get a single address by ID
 @router.get("/addresses/{address_id}", response_model=AddressResponse)
 def get_address(address_id: int, db: Session = Depends(get_db)):
-    address = db.query(Address).filter(Address.id == address_id).first()
+    address = db.get(Address, address_id)
     if not address:
         raise HTTPException(status_code=404, detail="Address not found")
     return address
@@ -25,24 +48,25 @@ def get_address(address_id: int, db: Session = Depends(get_db)):
 # Create a new address
 @router.post("/addresses/", response_model=AddressResponse)
 def create_address(address: AddressCreate, db: Session = Depends(get_db)):
-    new_address = Address(**address.dict())
+    # Only the fields the client sent; the rest fall back to the column defaults
+    new_address = Address(**address.dict(exclude_unset=True))
     db.add(new_address)
     db.commit()
-    db.refresh(new_address)
     return new_address
 
 # Update an existing address
 @router.put("/addresses/{address_id}", response_model=AddressResponse)
 def update_address(address_id: int, address: AddressCreate, db: Session = Depends(get_db)):
-    existing_address = db.query(Address).filter(Address.id == address_id).first()
+    # One UPDATE ... RETURNING replaces the load, the attribute-by-attribute update and the refresh.
+    # Only the fields the client sent are written, so omitted ones keep their stored values.
+    existing_address = db.execute(
+        update(Address).where(Address.id == address_id).values(**address.dict(exclude_unset=True)).returning(Address)
+    ).scalar_one_or_none()
     if not existing_address:
         raise HTTPException(status_code=404, detail="Address not found")
     
-    for key, value in address.dict().items():
-        setattr(existing_address, key, value)
-    
     db.commit()
-    db.refresh(existing_address)
+    invalidate(INSPECTION_LISTS)  # Cached inspection lists embed the address
     return existing_address
 
 # Delete an address
@@ -53,8 +77,14 @@ def delete_address(address_id: int, db: Session = Depends(get_db)):
 # Show the comments for the address
 @router.get("/addresses/{address_id}/comments", response_model=List[CommentResponse])
 def get_address_comments(address_id: int, db: Session = Depends(get_db)):
-    # Query the comments for the given address ID and order by created_at descending
-    comments = db.query(Comment).filter(Comment.address_id == address_id).order_by(Comment.created_at.desc()).all()
+    # Query the comments for the given address ID and order by created_at descending, with their authors in one batched query
+    comments = (
+        db.query(Comment)
+        .options(*eager_options(selectinload(Comment.user)))
+        .filter(Comment.address_id == address_id)
+        .order_by(Comment.created_at.desc())
+        .all()
+    )
     if not comments:
         raise HTTPException(status_code=404, detail="No comments found for this address")
     return comments
@@ -66,7 +96,6 @@ def create_comment_for_address(address_id: int, comment: CommentCreate, db: Sess
     new_comment = Comment(address_id=address_id, **comment.dict())
     db.add(new_comment)
     db.commit()
-    db.refresh(new_comment)
     return new_comment
 
 
@@ -77,39 +106,34 @@ def create_comment_for_address(address_id: int, comment: CommentCreate, db: Sess
 # Update a comment for the address
 @router.put("/addresses/{address_id}/comments/{comment_id}", response_model=CommentResponse)
 def update_address_comment(address_id: int, comment_id: int, comment: CommentResponse, db: Session = Depends(get_db)):
-    # Check if the address exists
-    address = db.query(Address).filter(Address.id == address_id).first()
-    if not address:
-        raise HTTPException(status_code=404, detail="Address not found")
-    
-    # Check if the comment exists
-    existing_comment = db.query(Comment).filter(Comment.id == comment_id, Comment.address_id == address_id).first()
+    # One UPDATE ... RETURNING, scoped to the address, replaces the load, the attribute-by-attribute update and the refresh.
+    # Only columns are written; the body also carries the nested user.
+    values = {key: value for key, value in comment.dict().items() if key in COMMENT_COLUMNS}
+    existing_comment = db.execute(
+        update(Comment).where(Comment.id == comment_id, Comment.address_id == address_id).values(**values).returning(Comment)
+    ).scalar_one_or_none()
     if not existing_comment:
+        # Nothing matched; tell a missing address apart from a missing comment
+        if not db.query(Address.id).filter(Address.id == address_id).scalar():
+            raise HTTPException(status_code=404, detail="Address not found")
         raise HTTPException(status_code=404, detail="Comment not found")
     
-    # Update the comment
-    for key, value in comment.dict().items():
-        setattr(existing_comment, key, value)
-    
     db.commit()
-    db.refresh(existing_comment)
     return existing_comment
 
 # Delete a comment for the address
 @router.delete("/addresses/{address_id}/comments/{comment_id}", response_model=CommentResponse)
 def delete_address_comment(address_id: int, comment_id: int, db: Session = Depends(get_db)):
-    # Check if the address exists
-    address = db.query(Address).filter(Address.id == address_id).first()
-    if not address:
-        raise HTTPException(status_code=404, detail="Address not found")
-    
-    # Check if the comment exists
-    existing_comment = db.query(Comment).filter(Comment.id == comment_id, Comment.address_id == address_id).first()
+    # One DELETE ... RETURNING, scoped to the address, replaces the address probe, the load and the ORM delete
+    existing_comment = db.execute(
+        delete(Comment).where(Comment.id == comment_id, Comment.address_id == address_id).returning(Comment)
+    ).scalar_one_or_none()
     if not existing_comment:
+        # Nothing matched; tell a missing address apart from a missing comment
+        if not db.query(Address.id).filter(Address.id == address_id).scalar():
+            raise HTTPException(status_code=404, detail="Address not found")
         raise HTTPException(status_code=404, detail="Comment not found")
     
-    # Delete the comment
-    db.delete(existing_comment)
     db.commit()
     return existing_comment
 
@@ -126,7 +150,7 @@ def get_address_violations(address_id: int, db: Session = Depends(get_db)):
 @router.post("/addresses/{address_id}/violations", response_model=ViolationResponse)
 def add_address_violation(address_id: int, violation: ViolationResponse, db: Session = Depends(get_db)):
     # Check if the address exists
-    address = db.query(Address).filter(Address.id == address_id).first()
+    address = db.query(Address.id).filter(Address.id == address_id).scalar()
     if not address:
         raise HTTPException(status_code=404, detail="Address not found")
     
@@ -134,45 +158,39 @@ def add_address_violation(address_id: int, violation: ViolationResponse, db: Ses
     new_violation = Violation(**violation.dict(), address_id=address_id)
     db.add(new_violation)
     db.commit()
-    db.refresh(new_violation)
     return new_violation
 
 # Update a violation for the address
 @router.put("/addresses/{address_id}/violations/{violation_id}", response_model=ViolationResponse)
 def update_address_violation(address_id: int, violation_id: int, violation: ViolationResponse, db: Session = Depends(get_db)):
-    # Check if the address exists
-    address = db.query(Address).filter(Address.id == address_id).first()
-    if not address:
-        raise HTTPException(status_code=404, detail="Address not found")
-    
-    # Check if the violation exists
-    existing_violation = db.query(Violation).filter(Violation.id == violation_id, Violation.address_id == address_id).first()
+    # One UPDATE ... RETURNING, scoped to the address, replaces the load, the attribute-by-attribute update and the refresh.
+    # Only columns are written; the body also carries the computed combadd and deadline_date.
+    values = {key: value for key, value in violation.dict().items() if key in VIOLATION_COLUMNS}
+    existing_violation = db.execute(
+        update(Violation).where(Violation.id == violation_id, Violation.address_id == address_id).values(**values).returning(Violation)
+    ).scalar_one_or_none()
     if not existing_violation:
+        # Nothing matched; tell a missing address apart from a missing violation
+        if not db.query(Address.id).filter(Address.id == address_id).scalar():
+            raise HTTPException(status_code=404, detail="Address not found")
         raise HTTPException(status_code=404, detail="Violation not found")
     
-    # Update the violation
-    for key, value in violation.dict().items():
-        setattr(existing_violation, key, value)
-    
     db.commit()
-    db.refresh(existing_violation)
     return existing_violation
 
 # Delete a violation for the address
 @router.delete("/addresses/{address_id}/violations/{violation_id}", response_model=ViolationResponse)
 def delete_address_violation(address_id: int, violation_id: int, db: Session = Depends(get_db)):
-    # Check if the address exists
-    address = db.query(Address).filter(Address.id == address_id).first()
-    if not address:
-        raise HTTPException(status_code=404, detail="Address not found")
-    
-    # Check if the violation exists
-    existing_violation = db.query(Violation).filter(Violation.id == violation_id, Violation.address_id == address_id).first()
+    # One DELETE ... RETURNING, scoped to the address, replaces the address probe, the load and the ORM delete
+    existing_violation = db.execute(
+        delete(Violation).where(Violation.id == violation_id, Violation.address_id == address_id).returning(Violation)
+    ).scalar_one_or_none()
     if not existing_violation:
+        # Nothing matched; tell a missing address apart from a missing violation
+        if not db.query(Address.id).filter(Address.id == address_id).scalar():
+            raise HTTPException(status_code=404, detail="Address not found")
         raise HTTPException(status_code=404, detail="Violation not found")
     
-    # Delete the violation
-    db.delete(existing_violation)
     db.commit()
     return existing_violation
 
@@ -180,7 +198,11 @@ def delete_address_violation(address_id: int, violation_id: int, db: Session = D
 @router.get("/addresses/{address_id}/inspections", response_model=List[InspectionResponse])
 def get_address_inspections(address_id: int, db: Session = Depends(get_db)):
     # Query the inspections for the given address ID and order by created_at descending
-    inspections = db.query(Inspection).filter(
+    inspections = db.query(Inspection).options(*eager_options(
+        selectinload(Inspection.address),
+        selectinload(Inspection.contact),
+        selectinload(Inspection.inspector)
+    )).filter(
         Inspection.address_id == address_id,
         Inspection.source != 'Complaint'
     ).order_by(Inspection.created_at.desc()).all()
@@ -192,7 +214,7 @@ def get_address_inspections(address_id: int, db: Session = Depends(get_db)):
 @router.post("/addresses/{address_id}/inspections", response_model=InspectionResponse)
 def add_address_inspection(address_id: int, inspection: InspectionResponse, db: Session = Depends(get_db)):
     # Check if the address exists
-    address = db.query(Address).filter(Address.id == address_id).first()
+    address = db.query(Address.id).filter(Address.id == address_id).scalar()
     if not address:
         raise HTTPException(status_code=404, detail="Address not found")
     
@@ -200,19 +222,28 @@ def add_address_inspection(address_id: int, inspection: InspectionResponse, db:
     new_inspection = Inspection(**inspection.dict(), address_id=address_id)
     db.add(new_inspection)
     db.commit()
-    db.refresh(new_inspection)
+    invalidate(INSPECTION_LISTS)
     return
 
 # Update an inspection for the address
 @router.put("/addresses/{address_id}/inspections/{inspection_id}", response_model=InspectionResponse)
 def update_address_inspection(address_id: int, inspection_id: int, inspection: InspectionResponse, db: Session = Depends(get_db)):
     # Check if the address exists
-    address = db.query(Address).filter(Address.id == address_id).first()
+    address = db.query(Address.id).filter(Address.id == address_id).scalar()
     if not address:
         raise HTTPException(status_code=404, detail="Address not found")
     
     # Check if the inspection exists
-    existing_inspection = db.query(Inspection).filter(Inspection.id == inspection_id, Inspection.address_id == address_id).first()
+    existing_inspection = (
+        db.query(Inspection)
+        .options(
+            joinedload(Inspection.address),
+            joinedload(Inspection.contact),
+            joinedload(Inspection.inspector)
+        )
+        .filter(Inspection.id == inspection_id, Inspection.address_id == address_id)
+        .first()
+    )
     if not existing_inspection:
         raise HTTPException(status_code=404, detail="Inspection not found")
     
@@ -220,15 +251,16 @@ def update_address_inspection(address_id: int, inspection_id: int, inspection: I
     for key, value in inspection.dict().items():
         setattr(existing_inspection, key, value)
     
+    # Sessions don't expire on commit, so the loaded inspection can be returned without another SELECT
     db.commit()
-    db.refresh(existing_inspection)
+    invalidate(INSPECTION_LISTS)
     return existing_inspection
 
 # Delete an inspection for the address
 @router.delete("/addresses/{address_id}/inspections/{inspection_id}", response_model=InspectionResponse)
 def delete_address_inspection(address_id: int, inspection_id: int, db: Session = Depends(get_db)):
     # Check if the address exists
-    address = db.query(Address).filter(Address.id == address_id).first()
+    address = db.query(Address.id).filter(Address.id == address_id).scalar()
     if not address:
         raise HTTPException(status_code=404, detail="Address not found")
     
@@ -240,6 +272,7 @@ def delete_address_inspection(address_id: int, inspection_id: int, db: Session =
     # Delete the inspection
     db.delete(existing_inspection)
     db.commit()
+    invalidate(INSPECTION_LISTS)
     return existing_inspection
 
 # Show all the units for the address
@@ -255,7 +288,7 @@ def get_address_units(address_id: int, db: Session = Depends(get_db)):
 @router.post("/addresses/{address_id}/units", response_model=UnitResponse)
 def create_unit(address_id: int, unit: UnitCreate, db: Session = Depends(get_db)):
     # Check if the address exists
-    address = db.query(Address).filter(Address.id == address_id).first()
+    address = db.query(Address.id).filter(Address.id == address_id).scalar()
     if not address:
         raise HTTPException(status_code=404, detail="Address not found")
     
@@ -263,13 +296,12 @@ def create_unit(address_id: int, unit: UnitCreate, db: Session = Depends(get_db)
     new_unit = Unit(**unit.dict(), address_id=address_id)
     db.add(new_unit)
     db.commit()
-    db.refresh(new_unit)
     return new_unit
 
 # Unit information
 @router.get("/units/{unit_id}", response_model=UnitResponse)
 def get_unit(unit_id: int, db: Session = Depends(get_db)):
-    unit = db.query(Unit).filter(Unit.id == unit_id).first()
+    unit = db.get(Unit, unit_id)
     if not unit:
         raise HTTPException(status_code=404, detail="Unit not found")
     return unit
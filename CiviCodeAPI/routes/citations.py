@@ -1,33 +1,33 @@
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, load_only
 from typing import List
-from models import Citation, Violation
+from models import Address, Citation, Violation
 from schemas import CitationCreate, CitationResponse, ViolationResponse
-from database import get_db
+from database import get_db, eager_options
 
 router = APIRouter()
 
 # Get all citations
 @router.get("/citations/", response_model=List[CitationResponse])
-def get_citations(skip: int = 0, db: Session = Depends(get_db)):
+def get_citations(skip: int = 0, limit: int = 50, db: Session = Depends(get_db)):
     citations = (
         db.query(Citation)
-        .options(
-            joinedload(Citation.violation).joinedload(Violation.address)
-        )
+        .options(*eager_options(
+            # Only the address's combadd is read, so load just the columns that reach it
+            joinedload(Citation.violation).load_only(Violation.address_id).joinedload(Violation.address).load_only(Address.combadd)
+        ))
         .order_by(Citation.created_at.desc())
         .offset(skip)
+        .limit(limit)
         .all()
     )
     
-    # Add combadd to the response
-    response = []
-    for citation in citations:
-        citation_dict = citation.__dict__
-        citation_dict['combadd'] = citation.violation.address.combadd
-        response.append(citation_dict)
-    
-    return response
+    # Validate each citation straight from the ORM object, then add combadd
+    return [
+        CitationResponse.model_validate(citation).model_copy(update={"combadd": citation.violation.address.combadd})
+        for citation in citations
+    ]
 
 # Create a new citation
 @router.post("/citations/", response_model=CitationResponse)
@@ -35,34 +35,34 @@ def create_citation(citation: CitationCreate, db: Session = Depends(get_db)):
     new_citation = Citation(**citation.dict())
     db.add(new_citation)
     db.commit()
-    db.refresh(new_citation)
     return new_citation
 
 # Get a specific citation by ID
 @router.get("/citations/{citation_id}", response_model=CitationResponse)
 def get_citation(citation_id: int, db: Session = Depends(get_db)):
-    citation = db.query(Citation).filter(Citation.id == citation_id).first()
+    citation = db.get(Citation, citation_id)
     if not citation:
         raise HTTPException(status_code=404, detail="Citation not found")
     return citation
 
 @router.get("/citations/address/{address_id}", response_model=List[CitationResponse])
 def get_citations_by_address(address_id: int, db: Session = Depends(get_db)):
-    # First, find all violations for the given address_id
-    violations = db.query(Violation).filter(Violation.address_id == address_id).all()
-
-    # Get the ids of those violations
-    violation_ids = [violation.id for violation in violations]
-
-    # Then, find all citations associated with those violations
-    citations = db.query(Citation).filter(Citation.violation_id.in_(violation_ids)).all()
+    # Find all citations whose violation belongs to the given address_id, letting Postgres resolve the violation ids
+    violation_ids = select(Violation.id).where(Violation.address_id == address_id)
+    # Select only the columns the response uses; the deadline stays a date, which the response model renders as YYYY-MM-DD
+    citations = (
+        db.query(Citation)
+        .with_entities(Citation.id, Citation.violation_id, Citation.deadline, Citation.created_at, Citation.updated_at)
+        .filter(Citation.violation_id.in_(violation_ids))
+        .all()
+    )
 
     # Manually serialize each citation
     serialized_citations = [
         {
             "id": citation.id,
             "violation_id": citation.violation_id,
-            "deadline": citation.deadline.strftime('%Y-%m-%d') if citation.deadline else None,
+            "deadline": citation.deadline,
             "created_at": citation.created_at,
             "updated_at": citation.updated_at,
         }
@@ -1,17 +1,29 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List
 from models import Code
-from schemas import CodeCreate, CodeResponse
+from schemas import dump_dict_list, CodeCreate, CodeResponse
 from database import get_db
+from cache import CODES, cache_key, get_or_set, invalidate
 
 router = APIRouter()
 
+# Codes are reference data that rarely change, and creating one invalidates them, so they can live longer
+CODE_CACHE_TTL_SECONDS = 300
+
 # Get all codes
 @router.get("/codes/", response_model=List[CodeResponse])
 def get_codes(db: Session = Depends(get_db)):
-    codes = db.query(Code).all()
-    return codes
+    def load_codes():
+        # Plain column rows skip the identity map, and the JSON is written without re-validating each one
+        codes = db.execute(
+            select(Code.id, Code.chapter, Code.section, Code.name, Code.description, Code.created_at, Code.updated_at)
+        ).mappings().all()
+        return dump_dict_list(CodeResponse, codes)
+
+    content = get_or_set(cache_key(CODES, "codes"), load_codes, CODE_CACHE_TTL_SECONDS)
+    return Response(content=content, media_type="application/json")
 
 # Create a new code
 @router.post("/codes/", response_model=CodeResponse)
@@ -19,13 +31,13 @@ def create_code(code: CodeCreate, db: Session = Depends(get_db)):
     new_code = Code(**code.dict())
     db.add(new_code)
     db.commit()
-    db.refresh(new_code)
+    invalidate(CODES)
     return new_code
 
 # Get a specific code by ID
 @router.get("/codes/{code_id}", response_model=CodeResponse)
 def get_code(code_id: int, db: Session = Depends(get_db)):
-    code = db.query(Code).filter(Code.id == code_id).first()
+    code = db.get(Code, code_id)
     if not code:
         raise HTTPException(status_code=404, detail="Code not found")
     return code
\ No newline at end of file
@@ -1,16 +1,20 @@
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import List
-from models import Comment, ContactComment, ActiveStorageAttachment, ActiveStorageBlob, User
+from models import Comment, ContactComment, ActiveStorageAttachment, ActiveStorageBlob
 from schemas import CommentCreate, CommentResponse, ContactCommentCreate, ContactCommentResponse, UserResponse
-from database import get_db
+from database import get_db, eager_options
 
 router = APIRouter()
 
+# Azure storage URL prefix for ActiveStorage photos
+photo_url_prefix = "https://codeenforcement.blob.core.windows.net/ce-container/"
+
 # Get all comments
 @router.get("/comments/", response_model=List[CommentResponse])
 def get_comments(skip: int = 0, db: Session = Depends(get_db)):
-    comments = db.query(Comment).offset(skip).all()
+    # CommentResponse includes each comment's user, so load them all in one batched query
+    comments = db.query(Comment).options(*eager_options(selectinload(Comment.user))).offset(skip).all()
     return comments
 
 # Create a new comment
@@ -19,23 +23,30 @@ def create_comment(comment: CommentCreate, db: Session = Depends(get_db)):
     new_comment = Comment(**comment.dict())
     db.add(new_comment)
     db.commit()
-    db.refresh(new_comment)
     return new_comment
 
 # Get all comments for a specific Address
 @router.get("/comments/address/{address_id}", response_model=List[CommentResponse])
 def get_comments_by_address(address_id: int, db: Session = Depends(get_db)):
-    comments = db.query(Comment).filter(Comment.address_id == address_id).order_by(Comment.created_at.desc()).all()
+    # Load every comment's user in one batched query rather than one lookup per comment
+    comments = (
+        db.query(Comment)
+        .options(*eager_options(selectinload(Comment.user)))
+        .filter(Comment.address_id == address_id)
+        .order_by(Comment.created_at.desc())
+        .all()
+    )
     comment_responses = []
     for comment in comments:
-        user = db.query(User).filter(User.id == comment.user_id).first()
+        user = comment.user
         if user is None:
             raise HTTPException(status_code=404, detail="User not found")
-        comment_responses.append(CommentResponse(
+        # Fields come straight from the ORM, so skip re-validating each row
+        comment_responses.append(CommentResponse.model_construct(
             id=comment.id,
             content=comment.content,
             user_id=comment.user_id,  # Make sure to include the user_id here
-            user=UserResponse(
+            user=UserResponse.model_construct(
                 id=user.id,
                 name=user.name,
                 email=user.email,
@@ -64,23 +75,29 @@ def get_comments_by_contact(contact_id: int, db: Session = Depends(get_db)):
 # Fetch Comment photo by ID
 @router.get("/comments/{comment_id}/photos")
 def get_comment_photos(comment_id: int, db: Session = Depends(get_db)):
-    # Retrieve the attachments for the comment
-    attachments = db.query(ActiveStorageAttachment).filter_by(record_id=comment_id, record_type='Comment', name='photos').all()
+    # Retrieve the attachments for the comment together with their blobs in one query
+    attachments = (
+        db.query(ActiveStorageAttachment, ActiveStorageBlob)
+        .outerjoin(ActiveStorageBlob, ActiveStorageBlob.id == ActiveStorageAttachment.blob_id)
+        .filter(
+            ActiveStorageAttachment.record_id == comment_id,
+            ActiveStorageAttachment.record_type == 'Comment',
+            ActiveStorageAttachment.name == 'photos'
+        )
+        .all()
+    )
     
     if not attachments:
         raise HTTPException(status_code=404, detail="Photos not found for this comment")
 
     photos = []
     
-    for attachment in attachments:
-        # Retrieve the associated blob for each attachment
-        blob = db.query(ActiveStorageBlob).filter_by(id=attachment.blob_id).first()
-        
+    for attachment, blob in attachments:
         if not blob:
             continue  # Skip if no blob found (edge case)
         
         # Construct the Azure storage URL for each photo
-        photo_url = f"https://codeenforcement.blob.core.windows.net/ce-container/{blob.key}"
+        photo_url = photo_url_prefix + blob.key
         
         # Append the photo details to the list
         photos.append({
@@ -97,5 +114,4 @@ def create_contact_comment(contact_id: int, comment: ContactCommentCreate, db: S
     new_comment = ContactComment(**comment.dict())
     db.add(new_comment)
     db.commit()
-    db.refresh(new_comment)
     return new_comment
\ No newline at end of file
@@ -19,13 +19,12 @@ def create_contact(contact: ContactCreate, db: Session = Depends(get_db)):
     new_contact = Contact(**contact.dict())
     db.add(new_contact)
     db.commit()
-    db.refresh(new_contact)
     return new_contact
 
 # Get a specific contact by ID
 @router.get("/contacts/{contact_id}", response_model=ContactResponse)
 def get_contact(contact_id: int, db: Session = Depends(get_db)):
-    contact = db.query(Contact).filter(Contact.id == contact_id).first()
+    contact = db.get(Contact, contact_id)
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
     return contact
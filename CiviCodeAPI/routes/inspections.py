@@ -1,11 +1,18 @@
-from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File, Form
-from sqlalchemy.orm import Session, joinedload
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File, Form, Request, Response
+from sqlalchemy import bindparam, func, insert, lambda_stmt, select, tuple_, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import List, Optional
+from datetime import datetime
 from models import Inspection, Contact, Address, Area, Room, Prompt, Observation, Photo
-from schemas import InspectionCreate, InspectionResponse, ContactResponse, AddressResponse, AreaResponse, AreaCreate, RoomResponse, RoomCreate, PromptCreate, PromptResponse, ObservationCreate, ObservationResponse
-from database import get_db
-from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient
+from schemas import construct_from_orm, dump_orm_list, dump_validated_list, InspectionCreate, InspectionResponse, ContactResponse, AddressResponse, AreaResponse, AreaCreate, RoomResponse, RoomCreate, PromptCreate, PromptResponse, ObservationCreate, ObservationResponse
+from database import get_db, get_async_db, eager_options
+from cache import INSPECTION_LISTS, ROOMS, cache_key, get_cached, get_or_set, set_cached, invalidate
+from azure.storage.blob.aio import BlobServiceClient, BlobClient, ContainerClient
 from dotenv import load_dotenv
+import asyncio
+import hashlib
 import os 
 import uuid
 
@@ -18,59 +25,133 @@ load_dotenv(dotenv_path=env_path)
 
 connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
 
-# Initialize the Azure Blob Storage client
-connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+# Initialize the Azure Blob Storage client (async, so uploads don't block the event loop; closed on app shutdown)
 blob_service_client = BlobServiceClient.from_connection_string(connection_string)
 
 container_name = "civicodephotos"
 
+# Public URL prefix for uploaded photos, built once rather than per file
+blob_url_prefix = f"https://{blob_service_client.account_name}.blob.core.windows.net/{container_name}/"
+
+# Rooms and prompts are reference data that rarely change, and every write invalidates them, so they can live longer
+ROOM_CACHE_TTL_SECONDS = 300
+
+# Upper bound on blob uploads running at once for a single request
+MAX_CONCURRENT_UPLOADS = 8
+
+# Keyset pagination over (created_at, id), newest first, so Postgres can walk the index and stop at the limit
+def paginate_inspections(stmt, skip: int, limit: int, cursor_created_at: Optional[datetime], cursor_id: Optional[int]):
+    if (cursor_created_at is None) != (cursor_id is None):
+        raise HTTPException(status_code=400, detail="cursor_created_at and cursor_id must be provided together")
+    if cursor_created_at is not None:
+        stmt = stmt.where(tuple_(Inspection.created_at, Inspection.id) < (cursor_created_at, cursor_id))
+    return stmt.order_by(Inspection.created_at.desc(), Inspection.id.desc()).offset(skip).limit(limit)
+
+# Serve an inspection list from the response cache, querying and serializing it only on a miss.
+# The body's ETag is cached with it, so a client that already has the current list gets a bodyless 304.
+async def cached_inspection_list(request: Request, db: AsyncSession, stmt, key) -> Response:
+    cached = get_cached(key)
+    if cached is None:
+        result = await db.execute(stmt)
+        content = dump_orm_list(InspectionResponse, result.scalars().all())
+        cached = (content, f'"{hashlib.blake2b(content, digest_size=8).hexdigest()}"')
+        set_cached(key, cached)
+    content, etag = cached
+    # no-cache makes clients revalidate every time, so they never hold on to a list a write has invalidated
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
+
 # Get all inspections
 @router.get("/inspections/", response_model=List[InspectionResponse])
-def get_inspections(skip: int = 0, db: Session = Depends(get_db)):
-    inspections = db.query(Inspection).filter(Inspection.source != 'Complaint').order_by(Inspection.created_at.desc()).offset(skip).all()
-    return inspections
+async def get_inspections(
+    request: Request,
+    skip: int = 0,
+    limit: int = 50,
+    cursor_created_at: Optional[datetime] = None,
+    cursor_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    stmt = (
+      select(Inspection)
+      .options(*eager_options(
+        selectinload(Inspection.address),  # Batch load the relationships InspectionResponse serializes
+        selectinload(Inspection.contact),
+        selectinload(Inspection.inspector)
+      ))
+      .where(Inspection.source != 'Complaint')
+    )
+    stmt = paginate_inspections(stmt, skip, limit, cursor_created_at, cursor_id)
+    key = cache_key(INSPECTION_LISTS, "inspections", skip, limit, cursor_created_at, cursor_id)
+    return await cached_inspection_list(request, db, stmt, key)
 
 # Get all complaints
 @router.get("/complaints/", response_model=List[InspectionResponse])
-def get_complaints(skip: int = 0, db: Session = Depends(get_db)):
-    complaints = db.query(Inspection).filter(Inspection.source == 'Complaint').order_by(Inspection.created_at.desc()).offset(skip).all()
-    return complaints
+async def get_complaints(
+    request: Request,
+    skip: int = 0,
+    limit: int = 50,
+    cursor_created_at: Optional[datetime] = None,
+    cursor_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    stmt = (
+      select(Inspection)
+      .options(*eager_options(
+        selectinload(Inspection.address),  # Batch load the relationships InspectionResponse serializes
+        selectinload(Inspection.contact),
+        selectinload(Inspection.inspector)
+      ))
+      .where(Inspection.source == 'Complaint')
+    )
+    stmt = paginate_inspections(stmt, skip, limit, cursor_created_at, cursor_id)
+    key = cache_key(INSPECTION_LISTS, "complaints", skip, limit, cursor_created_at, cursor_id)
+    return await cached_inspection_list(request, db, stmt, key)
 
 # Create a new inspection
 @router.post("/inspections/", response_model=InspectionResponse)
 def create_inspection(inspection: InspectionCreate, db: Session = Depends(get_db)):
-    new_inspection = Inspection(**inspection.dict())
-    db.add(new_inspection)
+    # RETURNING hands back the inserted row, so there is no refresh SELECT after the commit
+    new_inspection = db.execute(insert(Inspection).values(**inspection.dict()).returning(Inspection)).scalar_one()
     db.commit()
-    db.refresh(new_inspection)
+    invalidate(INSPECTION_LISTS)
     return new_inspection
 
-# Get a specific inspection by ID
-@router.get("/inspections/{inspection_id}", response_model=InspectionResponse)
-def get_inspection(inspection_id: int, db: Session = Depends(get_db)):
-    inspection = (
-      db.query(Inspection)
+# Single inspection lookup, built once so the SQL and loader options are cached across requests
+inspection_by_id_stmt = lambda_stmt(
+    lambda: select(Inspection)
       .options(
         joinedload(Inspection.address),  # Eagerly load address relationship
-        joinedload(Inspection.contact)  # Eagerly load contact relationship
-      )
-      .filter(Inspection.id == inspection_id)
-      .first()
+        joinedload(Inspection.contact),  # Eagerly load contact relationship
+        joinedload(Inspection.inspector)  # Eagerly load inspector relationship (User)
       )
+      .where(Inspection.id == bindparam("iid"))
+)
+
+# Get a specific inspection by ID
+@router.get("/inspections/{inspection_id}", response_model=InspectionResponse)
+def get_inspection(inspection_id: int, db: Session = Depends(get_db)):
+    inspection = db.execute(inspection_by_id_stmt, {"iid": inspection_id}).scalar_one_or_none()
 
     if not inspection:
         raise HTTPException(status_code=404, detail="Inspection not found")
-    return inspection
+
+    # The row comes straight from the database, so serialize it without re-validating every field
+    content = construct_from_orm(InspectionResponse, inspection).model_dump_json()
+    return Response(content=content, media_type="application/json")
 
 # Get all inspections for a specific Address
 @router.get("/inspections/address/{address_id}", response_model=List[InspectionResponse])
 def get_inspections_by_address(address_id: int, db: Session = Depends(get_db)):
     inspections = (
       db.query(Inspection)
-      .options(
+      .options(*eager_options(
         joinedload(Inspection.address),  # Eagerly load address relationship
+        joinedload(Inspection.contact),  # Eagerly load contact relationship
         joinedload(Inspection.inspector)  # Eagerly load inspector relationship (User)
-      )
+      ))
       .filter(
       Inspection.address_id == address_id,
       Inspection.source != 'Complaint')
@@ -83,16 +164,17 @@ def get_inspections_by_address(address_id: int, db: Session = Depends(get_db)):
 def get_complaints_by_address(address_id: int, db: Session = Depends(get_db)):
     complaints = (
       db.query(Inspection)
-      .options(
+      .options(*eager_options(
         joinedload(Inspection.address),  # Eagerly load address relationship
+        joinedload(Inspection.contact),  # Eagerly load contact relationship
         joinedload(Inspection.inspector)  # Eagerly load inspector relationship (User)
-      )
+      ))
       .filter(
       Inspection.address_id == address_id,
       Inspection.source == 'Complaint')
       .all()
     )
-    return complaints
+    return Response(content=dump_orm_list(InspectionResponse, complaints), media_type="application/json")
 
   
 # Get all areas beloning to a specific inspection
@@ -100,12 +182,13 @@ def get_complaints_by_address(address_id: int, db: Session = Depends(get_db)):
 def get_areas_by_inspection(inspection_id: int, db: Session = Depends(get_db)):
     areas = db.query(Area).filter(Area.inspection_id == inspection_id
     ).order_by(Area.created_at.desc()).all()
-    return areas
+    # Validated, not constructed: Area.photos is a String column but AreaResponse.photos is a list
+    return Response(content=dump_validated_list(AreaResponse, areas), media_type="application/json")
 
 # Create a new area
 @router.post("/inspections/{inspection_id}/areas", response_model=AreaResponse)
 def create_area_for_inspection(inspection_id: int, area: AreaCreate, db: Session = Depends(get_db)):
-    inspection = db.query(Inspection).filter(Inspection.id == inspection_id).first()
+    inspection = db.query(Inspection.id).filter(Inspection.id == inspection_id).scalar()
 
     if not inspection:
         raise HTTPException(status_code=404, detail="Inspection not found")
@@ -114,7 +197,6 @@ def create_area_for_inspection(inspection_id: int, area: AreaCreate, db: Session
     new_area = Area(**area.dict(), inspection_id=inspection_id)
     db.add(new_area)
     db.commit()
-    db.refresh(new_area)
 
     return new_area
 
@@ -123,12 +205,13 @@ def create_area_for_inspection(inspection_id: int, area: AreaCreate, db: Session
 def get_areas_by_unit(inspection_id: int, unit_id: int, db: Session = Depends(get_db)):
     areas = db.query(Area).filter(Area.inspection_id == inspection_id, Area.unit_id == unit_id
     ).order_by(Area.created_at.desc()).all()
-    return areas
+    # Validated, not constructed: Area.photos is a String column but AreaResponse.photos is a list
+    return Response(content=dump_validated_list(AreaResponse, areas), media_type="application/json")
 
 # Create an area for a specific unit
 @router.post("/inspections/{inspection_id}/unit/{unit_id}/areas", response_model=AreaResponse)
 def create_area_for_unit(inspection_id: int, unit_id: int, area: AreaCreate, db: Session = Depends(get_db)):
-    inspection = db.query(Inspection).filter(Inspection.id == inspection_id).first()
+    inspection = db.query(Inspection.id).filter(Inspection.id == inspection_id).scalar()
 
     if not inspection:
         raise HTTPException(status_code=404, detail="Inspection not found")
@@ -140,21 +223,25 @@ def create_area_for_unit(inspection_id: int, unit_id: int, area: AreaCreate, db:
     new_area = Area(**area_data)
     db.add(new_area)
     db.commit()
-    db.refresh(new_area)
 
     return new_area
 
 # Get all areas for a specific inspection and unit
 @router.get("/inspections/{inspection_id}/unit/{unit_id}/areas/count", response_model=int)
 def get_area_count_by_unit_and_inspection(inspection_id: int, unit_id: int, db: Session = Depends(get_db)):
-    area_count = db.query(Area).filter(Area.inspection_id == inspection_id, Area.unit_id == unit_id).count()
-    return area_count
+    # A flat COUNT lets Postgres answer from the (inspection_id, unit_id) index instead of counting a wrapped entity SELECT
+    area_count = db.query(func.count()).select_from(Area).filter(Area.inspection_id == inspection_id, Area.unit_id == unit_id).scalar()
+    return area_count or 0
 
 # Get all rooms
 @router.get("/rooms/", response_model=List[RoomResponse])
 def get_rooms(skip: int = 0, db: Session = Depends(get_db)):
-    rooms = db.query(Room).offset(skip).all()
-    return rooms
+    content = get_or_set(
+        cache_key(ROOMS, "rooms", skip),
+        lambda: dump_orm_list(RoomResponse, db.query(Room).offset(skip).all()),
+        ROOM_CACHE_TTL_SECONDS
+    )
+    return Response(content=content, media_type="application/json")
 
 # Create a new room
 @router.post("/rooms/", response_model=RoomResponse)
@@ -162,51 +249,60 @@ def create_room(room: RoomCreate, db: Session = Depends(get_db)):
     new_room = Room(**room.dict())
     db.add(new_room)
     db.commit()
-    db.refresh(new_room)
+    invalidate(ROOMS)
     return new_room
 
 # Show a room
 @router.get("/rooms/{room_id}", response_model=RoomResponse)
 def get_room(room_id: int, db: Session = Depends(get_db)):
-    room = db.query(Room).filter(Room.id == room_id).first()
-    if not room:
-        raise HTTPException(status_code=404, detail="Room not found")
-    return room
+    def load_room():
+        room = db.get(Room, room_id)
+        if not room:
+            raise HTTPException(status_code=404, detail="Room not found")
+        return construct_from_orm(RoomResponse, room).model_dump_json()
+
+    content = get_or_set(cache_key(ROOMS, "room", room_id), load_room, ROOM_CACHE_TTL_SECONDS)
+    return Response(content=content, media_type="application/json")
 
 # Edit a room
 @router.put("/rooms/{room_id}", response_model=RoomResponse)
 def update_room(room_id: int, room: RoomCreate, db: Session = Depends(get_db)):
-    room_to_update = db.query(Room).filter(Room.id == room_id).first()
+    # One UPDATE ... RETURNING replaces the load, the attribute-by-attribute update and the refresh
+    room_to_update = db.execute(
+        update(Room).where(Room.id == room_id).values(**room.dict()).returning(Room)
+    ).scalar_one_or_none()
     if not room_to_update:
         raise HTTPException(status_code=404, detail="Room not found")
-    room_data = room.dict()
-    for key, value in room_data.items():
-        setattr(room_to_update, key, value)
     db.commit()
-    db.refresh(room_to_update)
+    invalidate(ROOMS)
     return room_to_update
 
 # Delete a room
 @router.delete("/rooms/{room_id}")
 def delete_room(room_id: int, db: Session = Depends(get_db)):
-    room = db.query(Room).filter(Room.id == room_id).first()
+    room = db.get(Room, room_id)
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
     db.delete(room)
     db.commit()
+    invalidate(ROOMS)
     return {"message": "Room deleted successfully"}
 
 # Get all prompts for a specific Room
 @router.get("/rooms/{room_id}/prompts", response_model=List[PromptResponse])
 def get_prompts_by_room(room_id: int, db: Session = Depends(get_db)):
-    prompts = db.query(Prompt).filter(Prompt.room_id == room_id).all()
-    return prompts
+    content = get_or_set(
+        cache_key(ROOMS, "prompts", room_id),
+        lambda: dump_orm_list(PromptResponse, db.query(Prompt).filter(Prompt.room_id == room_id).all()),
+        ROOM_CACHE_TTL_SECONDS
+    )
+    return Response(content=content, media_type="application/json")
 
 
 # Create a new prompt
 @router.post("/rooms/{room_id}/prompts", response_model=PromptResponse)
 def create_prompt_for_room(room_id: int, prompt: PromptCreate, db: Session = Depends(get_db)):
-    room = db.query(Room).filter(Room.id == room_id).first()
+    room = db.query(Room.id).filter(Room.id == room_id).scalar()
 
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
@@ -215,37 +311,38 @@ def create_prompt_for_room(room_id: int, prompt: PromptCreate, db: Session = Dep
     new_prompt = Prompt(**prompt.dict(), room_id=room_id)
     db.add(new_prompt)
     db.commit()
-    db.refresh(new_prompt)
+    invalidate(ROOMS)
 
     return new_prompt
 
 # Edit a prompt
 @router.put("/prompts/{prompt_id}", response_model=PromptResponse)
 def update_prompt(prompt_id: int, prompt: PromptCreate, db: Session = Depends(get_db)):
-    prompt_to_update = db.query(Prompt).filter(Prompt.id == prompt_id).first()
+    # One UPDATE ... RETURNING replaces the load, the attribute-by-attribute update and the refresh
+    prompt_to_update = db.execute(
+        update(Prompt).where(Prompt.id == prompt_id).values(**prompt.dict()).returning(Prompt)
+    ).scalar_one_or_none()
     if not prompt_to_update:
         raise HTTPException(status_code=404, detail="Prompt not found")
-    prompt_data = prompt.dict()
-    for key, value in prompt_data.items():
-        setattr(prompt_to_update, key, value)
     db.commit()
-    db.refresh(prompt_to_update)
+    invalidate(ROOMS)
     return prompt_to_update
 
 # Delete a prompt
 @router.delete("/prompts/{prompt_id}")
 def delete_prompt(prompt_id: int, db: Session = Depends(get_db)):
-    prompt = db.query(Prompt).filter(Prompt.id == prompt_id).first()
+    prompt = db.get(Prompt, prompt_id)
     if not prompt:
         raise HTTPException(status_code=404, detail="Prompt not found")
     db.delete(prompt)
     db.commit()
+    invalidate(ROOMS)
     return {"message": "Prompt deleted successfully"}
 
 # Get specific Area
 @router.get("/areas/{area_id}", response_model=AreaResponse)
 def get_area(area_id: int, db: Session = Depends(get_db)):
-    area = db.query(Area).filter(Area.id == area_id).first()
+    area = db.get(Area, area_id)
     if not area:
         raise HTTPException(status_code=404, detail="Area not found")
     return area
@@ -253,20 +350,19 @@ def get_area(area_id: int, db: Session = Depends(get_db)):
 # Edit an area
 @router.put("/areas/{area_id}", response_model=AreaResponse)
 def update_area(area_id: int, area: AreaCreate, db: Session = Depends(get_db)):
-    area_to_update = db.query(Area).filter(Area.id == area_id).first()
+    # One UPDATE ... RETURNING replaces the load, the attribute-by-attribute update and the refresh
+    area_to_update = db.execute(
+        update(Area).where(Area.id == area_id).values(**area.dict()).returning(Area)
+    ).scalar_one_or_none()
     if not area_to_update:
         raise HTTPException(status_code=404, detail="Area not found")
-    area_data = area.dict()
-    for key, value in area_data.items():
-        setattr(area_to_update, key, value)
     db.commit()
-    db.refresh(area_to_update)
     return area_to_update
 
 # Delete an area
 @router.delete("/areas/{area_id}")
 def delete_area(area_id: int, db: Session = Depends(get_db)):
-    area = db.query(Area).filter(Area.id == area_id).first()
+    area = db.get(Area, area_id)
     if not area:
         raise HTTPException(status_code=404, detail="Area not found")
     db.delete(area)
@@ -276,8 +372,13 @@ def delete_area(area_id: int, db: Session = Depends(get_db)):
 # Get all observations for a specific area
 @router.get("/areas/{area_id}/observations", response_model=List[ObservationResponse])
 def get_observations_for_area(area_id: int, db: Session = Depends(get_db)):
-    observations = db.query(Observation).filter(Observation.area_id == area_id).all()
-    return observations
+    observations = (
+        db.query(Observation)
+        .options(*eager_options(selectinload(Observation.photos)))  # ObservationResponse serializes the photos
+        .filter(Observation.area_id == area_id)
+        .all()
+    )
+    return Response(content=dump_orm_list(ObservationResponse, observations), media_type="application/json")
 
 # Create a new observation for an area
 @router.post("/areas/{area_id}/observations", response_model=ObservationResponse, status_code=status.HTTP_201_CREATED)
@@ -287,7 +388,7 @@ def create_observation_for_area(
     db: Session = Depends(get_db)
 ):
     # Create the observation entry in the database
-    area = db.query(Area).filter(Area.id == area_id).first()
+    area = db.query(Area.id).filter(Area.id == area_id).scalar()
     if not area:
         raise HTTPException(status_code=404, detail="Area not found")
 
@@ -298,12 +399,26 @@ def create_observation_for_area(
     )
     db.add(new_observation)
     db.commit()
-    db.refresh(new_observation)
 
     return new_observation
 
 
 
+# Upload a single photo to blob storage and return its public URL
+async def upload_photo_to_blob(file: UploadFile, semaphore: asyncio.Semaphore) -> str:
+    blob_name = f"{uuid.uuid4()}-{file.filename}"
+    blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+
+    async with semaphore:
+        try:
+            # Passing the length lets the SDK stream the spooled file in staged blocks, several at a time,
+            # instead of probing its size first
+            await blob_client.upload_blob(file.file, length=file.size, overwrite=True, max_concurrency=4)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to upload file {file.filename}: {str(e)}")
+
+    return blob_url_prefix + blob_name
+
 # Upload photos for an observation
 @router.post("/observations/{observation_id}/photos", status_code=status.HTTP_201_CREATED)
 async def upload_photos_for_observation(
@@ -311,24 +426,20 @@ async def upload_photos_for_observation(
     files: List[UploadFile] = File(...), 
     db: Session = Depends(get_db)
 ):
-    observation = db.query(Observation).filter(Observation.id == observation_id).first()
+    observation = db.query(Observation.id).filter(Observation.id == observation_id).scalar()
     if not observation:
         raise HTTPException(status_code=404, detail="Observation not found")
     
-    for file in files:
-        blob_name = f"{uuid.uuid4()}-{file.filename}"
-        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
-
-        try:
-            blob_client.upload_blob(file.file, overwrite=True)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to upload file {file.filename}: {str(e)}")
-
-        photo_url = f"https://{blob_service_client.account_name}.blob.core.windows.net/{container_name}/{blob_name}"
-
-        db_photo = Photo(url=photo_url, observation_id=observation_id)
-        db.add(db_photo)
-
-    db.commit()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+    photo_urls = await asyncio.gather(*(upload_photo_to_blob(file, semaphore) for file in files))
+
+    # All photo rows go in one transaction; if it fails, none of them are saved. A Core executemany skips
+    # building ORM objects and the unit-of-work flush, since nothing reads the rows back
+    try:
+        db.execute(insert(Photo), [{"url": photo_url, "observation_id": observation_id} for photo_url in photo_urls])
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to save photos: {str(e)}")
 
     return {"detail": "Photos uploaded successfully"}
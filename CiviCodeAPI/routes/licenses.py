@@ -1,14 +1,26 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 from models import License
-from schemas import LicenseCreate, LicenseResponse
+from schemas import dump_validated_list, LicenseCreate, LicenseResponse
 from database import get_db
 
 router = APIRouter()
 
-# Show all the licenses
+# Show all the licenses, newest first, with keyset pagination over (created_at, id)
 @router.get("/licenses/", response_model=List[LicenseResponse])
-def get_licenses(db: Session = Depends(get_db)):
-    licenses = db.query(License).all()
-    return licenses
\ No newline at end of file
+def get_licenses(
+    limit: int = 50,
+    cursor_created_at: Optional[datetime] = None,
+    cursor_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    if (cursor_created_at is None) != (cursor_id is None):
+        raise HTTPException(status_code=400, detail="cursor_created_at and cursor_id must be provided together")
+    query = db.query(License)
+    if cursor_created_at is not None:
+        query = query.filter(tuple_(License.created_at, License.id) < (cursor_created_at, cursor_id))
+    licenses = query.order_by(License.created_at.desc(), License.id.desc()).limit(limit).all()
+    return Response(content=dump_validated_list(LicenseResponse, licenses), media_type="application/json")
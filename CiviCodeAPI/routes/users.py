@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from typing import List, Union
@@ -6,11 +6,17 @@ from models import User
 from schemas import UserResponse
 from database import get_db
 from utils import verify_password
+from cache import TOKENS, USERS, DEFAULT_TTL_SECONDS, cache_key, get_cached, get_or_set, set_cached
 from datetime import datetime, timedelta
+import hashlib
 import jwt
+import os
+import time
 
-SECRET_KEY = "trpdds2020"  
+# Set SECRET_KEY in the environment; the fallback only keeps existing deployments signing tokens the same way
+SECRET_KEY = os.getenv("SECRET_KEY", "trpdds2020")
 ALGORITHM = "HS256"
+ALGORITHMS = (ALGORITHM,)  # Accepted when decoding, built once rather than per call
 ACCESS_TOKEN_EXPIRE_MINUTES = 480
 
 def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None):
@@ -23,6 +29,18 @@ def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+# Verify each token's signature once and reuse the payload for repeat requests with the same token.
+# Entries are keyed by the token's SHA-256 so raw tokens are never held in memory, and never outlive the token's exp
+# (tokens without one, which jwt.decode still accepts, get the default TTL); invalid tokens raise before anything is stored.
+def decode_access_token(token: str) -> dict:
+    key = cache_key(TOKENS, hashlib.sha256(token.encode()).hexdigest())
+    payload = get_cached(key)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=ALGORITHMS)
+        exp = payload.get("exp")
+        set_cached(key, payload, DEFAULT_TTL_SECONDS if exp is None else min(DEFAULT_TTL_SECONDS, exp - time.time()))
+    return payload
+
 router = APIRouter()
 
 # Show all the users
@@ -59,9 +77,15 @@ async def read_users_me(
     token: str = Depends(OAuth2PasswordBearer(tokenUrl="/login")),
     db: Session = Depends(get_db)
 ):
-    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    payload = decode_access_token(token)
     user_id = int(payload.get("sub"))
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise HTTPException(status_code=404, detail="User not found")
-    return user
\ No newline at end of file
+
+    # Clients poll this on every page load, so serve the user briefly from the cache instead of a SELECT each time
+    def load_user():
+        user = db.get(User, user_id)
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return UserResponse.model_validate(user).model_dump_json()
+
+    content = get_or_set(cache_key(USERS, user_id), load_user)
+    return Response(content=content, media_type="application/json")
\ No newline at end of file
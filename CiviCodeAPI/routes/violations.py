@@ -1,21 +1,25 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, HTTPException, Depends, Response
+from sqlalchemy.orm import Session, joinedload, load_only
 from typing import List
-from models import Violation, Citation
-from schemas import ViolationCreate, ViolationResponse, CitationResponse
-from database import get_db
-from sqlalchemy import desc
+from models import Address, Citation, Code, Violation
+from schemas import dump_dict_list, ViolationCreate, ViolationResponse, CitationResponse
+from database import get_db, eager_options
+from sqlalchemy import desc, inspect as sa_inspect
 
 router = APIRouter()
 
+# Column names, read from the mapper once instead of walking every row's __dict__
+VIOLATION_COLUMNS = tuple(column.key for column in sa_inspect(Violation).mapper.column_attrs)
+
 # Get all violations
 @router.get("/violations/", response_model=List[ViolationResponse])
-def get_violations(skip: int = 0, db: Session = Depends(get_db)):
+def get_violations(skip: int = 0, limit: int = 50, db: Session = Depends(get_db)):
     violations = (
         db.query(Violation)
-        .options(joinedload(Violation.address))  # Eagerly load the Address relationship
+        .options(*eager_options(joinedload(Violation.address).load_only(Address.combadd)))  # Eagerly load the address, which only supplies combadd
         .order_by(desc(Violation.created_at))
         .offset(skip)
+        .limit(limit)
         .all()
     )
 
@@ -24,12 +28,13 @@ def get_violations(skip: int = 0, db: Session = Depends(get_db)):
     # Add combadd to the response
     response = []
     for violation in violations:
-        violation_dict = violation.__dict__
+        violation_dict = {key: getattr(violation, key) for key in VIOLATION_COLUMNS}
         violation_dict['combadd'] = violation.address.combadd if violation.address else None
         violation_dict['deadline_date'] = violation.deadline_date  # Directly access the computed property
         response.append(violation_dict)
     
-    return response
+    # The columns already have the schema's types, so serialize without validating every row
+    return Response(content=dump_dict_list(ViolationResponse, response), media_type="application/json")
 
 # Create a new violation
 @router.post("/violations/", response_model=ViolationResponse)
@@ -37,13 +42,12 @@ def create_violation(violation: ViolationCreate, db: Session = Depends(get_db)):
     new_violation = Violation(**violation.dict())
     db.add(new_violation)
     db.commit()
-    db.refresh(new_violation)
     return new_violation
 
 # Get a specific violation by ID
 @router.get("/violation/{violation_id}", response_model=ViolationResponse)
 def get_violation(violation_id: int, db: Session = Depends(get_db)):
-    violation = db.query(Violation).filter(Violation.id == violation_id).first()
+    violation = db.get(Violation, violation_id)
     if not violation:
         raise HTTPException(status_code=404, detail="Violation not found")
     return violation
@@ -57,22 +61,19 @@ def get_violations_by_address(address_id: int, db: Session = Depends(get_db)):
 # Show all citations for a specific Violation
 @router.get("/violation/{violation_id}/citations", response_model=List[CitationResponse])
 def get_citations_by_violation(violation_id: int, db: Session = Depends(get_db)):
+    # One round trip: join in just the address's combadd and the code name rather than loading the related rows
     citations = (
-        db.query(Citation)
-        .options(
-            joinedload(Citation.violation).joinedload(Violation.address),
-            joinedload(Citation.code)  # Eagerly load the Code relationship
-        )
+        db.query(Citation, Address.combadd, Code.name)
+        .join(Citation.violation)
+        .join(Violation.address)
+        .outerjoin(Citation.code)
+        .options(*eager_options())
         .filter(Citation.violation_id == violation_id)
         .all()
     )
     
-    # Add combadd and code.name to the response
-    response = []
-    for citation in citations:
-        citation_dict = citation.__dict__
-        citation_dict['combadd'] = citation.violation.address.combadd
-        citation_dict['code_name'] = citation.code.name if citation.code else None
-        response.append(citation_dict)
-    
-    return response
\ No newline at end of file
+    # Validate each citation straight from the ORM object, then add combadd and code.name
+    return [
+        CitationResponse.model_validate(citation).model_copy(update={"combadd": combadd, "code_name": code_name})
+        for citation, combadd, code_name in citations
+    ]
\ No newline at end of file
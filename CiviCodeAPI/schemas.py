@@ -1,5 +1,6 @@
-from pydantic import BaseModel, validator
-from typing import Optional, List
+from pydantic import BaseModel, TypeAdapter, validator
+from typing import Optional, List, get_args, get_origin
+from functools import lru_cache
 from datetime import datetime, date
 from constants import DEADLINE_OPTIONS, DEADLINE_VALUES
 
@@ -386,3 +387,45 @@ class ObservationResponse(ObservationBase):
     class Config:
         from_attributes = True
 
+# Build a response model from a trusted ORM object without running validation, constructing nested models too
+def construct_from_orm(model, obj):
+    values = {}
+    for name, field in model.model_fields.items():
+        if not hasattr(obj, name):
+            continue  # model_construct fills in the field default
+        values[name] = _construct_value(field.annotation, getattr(obj, name))
+    return model.model_construct(**values)
+
+def _construct_value(annotation, value):
+    if value is None:
+        return None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return construct_from_orm(annotation, value)
+    if get_origin(annotation) in (list, List):
+        # A string would be walked character by character; refuse it as validation would instead of serving garbage
+        if isinstance(value, (str, bytes)):
+            raise TypeError(f"expected a list for {annotation}, got {type(value).__name__}")
+        (item_annotation,) = get_args(annotation)
+        return [_construct_value(item_annotation, item) for item in value]
+    # Optional[X] is Union[X, None]; unwrap it and try again
+    args = [arg for arg in get_args(annotation) if arg is not type(None)]
+    if len(args) == 1:
+        return _construct_value(args[0], value)
+    return value
+
+@lru_cache(maxsize=None)
+def _list_adapter(model):
+    return TypeAdapter(List[model])
+
+# Serialize trusted ORM rows straight to JSON bytes, skipping validation and jsonable_encoder
+def dump_orm_list(model, rows) -> bytes:
+    return _list_adapter(model).dump_json([construct_from_orm(model, row) for row in rows])
+
+# Serialize trusted dicts (columns plus computed fields) straight to JSON bytes, skipping validation
+def dump_dict_list(model, rows) -> bytes:
+    return _list_adapter(model).dump_json([model.model_construct(**row) for row in rows])
+
+# Like dump_orm_list, but validates each row, for schemas whose field types differ from the columns' (e.g. bool -> int)
+def dump_validated_list(model, rows) -> bytes:
+    adapter = _list_adapter(model)
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
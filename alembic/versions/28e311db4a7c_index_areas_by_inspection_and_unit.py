@@ -0,0 +1,29 @@
+"""Index areas by inspection and unit
+
+Revision ID: 28e311db4a7c
+Revises: 8ae02bf12abb
+Create Date: 2026-10-17 14:53:45.197150
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '28e311db4a7c'
+down_revision: Union[str, None] = '8ae02bf12abb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The composite index leads with inspection_id, so the single-column one becomes redundant
+    op.create_index('ix_areas_inspection_id_unit_id', 'areas', ['inspection_id', 'unit_id'], unique=False)
+    op.drop_index('ix_areas_inspection_id', table_name='areas')
+
+
+def downgrade() -> None:
+    op.create_index('ix_areas_inspection_id', 'areas', ['inspection_id'], unique=False)
+    op.drop_index('ix_areas_inspection_id_unit_id', table_name='areas')
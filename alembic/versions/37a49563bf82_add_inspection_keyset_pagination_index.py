@@ -0,0 +1,32 @@
+"""Add inspection keyset pagination index
+
+Revision ID: 37a49563bf82
+Revises: 9f1678163bdf
+Create Date: 2026-10-17 09:47:05.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '37a49563bf82'
+down_revision: Union[str, None] = '9f1678163bdf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_inspections_created_id',
+        'inspections',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text("source != 'Complaint'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_inspections_created_id', table_name='inspections')
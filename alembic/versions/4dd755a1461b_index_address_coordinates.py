@@ -0,0 +1,26 @@
+"""Index address coordinates
+
+Revision ID: 4dd755a1461b
+Revises: edecb60d3de1
+Create Date: 2026-10-17 15:01:55.303790
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4dd755a1461b'
+down_revision: Union[str, None] = 'edecb60d3de1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_addresses_latitude_longitude', 'addresses', ['latitude', 'longitude'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_addresses_latitude_longitude', table_name='addresses')
@@ -0,0 +1,28 @@
+"""Index comments and units by address and creation time
+
+Revision ID: 6eb152e63e8b
+Revises: c94aaf705b08
+Create Date: 2026-10-17 15:08:09.731986
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6eb152e63e8b'
+down_revision: Union[str, None] = 'c94aaf705b08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_comments_address_id_created_at', 'comments', ['address_id', sa.text('created_at DESC')], unique=False)
+    op.create_index('ix_units_address_id_created_at', 'units', ['address_id', sa.text('created_at DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_units_address_id_created_at', table_name='units')
+    op.drop_index('ix_comments_address_id_created_at', table_name='comments')
@@ -0,0 +1,28 @@
+"""Default active storage timestamps in the database
+
+Revision ID: 8ae02bf12abb
+Revises: d496fc82586f
+Create Date: 2026-10-17 14:51:36.704754
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8ae02bf12abb'
+down_revision: Union[str, None] = 'd496fc82586f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ('active_storage_attachments', 'active_storage_blobs'):
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(), existing_nullable=False, server_default=sa.func.now())
+
+
+def downgrade() -> None:
+    for table in ('active_storage_attachments', 'active_storage_blobs'):
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(), existing_nullable=False, server_default=None)
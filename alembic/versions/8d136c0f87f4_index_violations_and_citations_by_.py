@@ -0,0 +1,28 @@
+"""Index violations and citations by creation time
+
+Revision ID: 8d136c0f87f4
+Revises: 6eb152e63e8b
+Create Date: 2026-10-17 15:08:46.764387
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d136c0f87f4'
+down_revision: Union[str, None] = '6eb152e63e8b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_violations_created_at', 'violations', [sa.text('created_at DESC')], unique=False)
+    op.create_index('ix_citations_created_at', 'citations', [sa.text('created_at DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_citations_created_at', table_name='citations')
+    op.drop_index('ix_violations_created_at', table_name='violations')
@@ -0,0 +1,55 @@
+"""Cascade deletes from inspections and violations
+
+Revision ID: 9f1678163bdf
+Revises: bc1efe6b5407
+Create Date: 2026-10-17 09:12:41.503117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f1678163bdf'
+down_revision: Union[str, None] = 'bc1efe6b5407'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referenced table) for every child row that should go away with its parent
+CASCADE_FOREIGN_KEYS = [
+    ('areas', 'inspection_id', 'inspections'),
+    ('inspection_codes', 'inspection_id', 'inspections'),
+    ('inspection_comments', 'inspection_id', 'inspections'),
+    ('licenses', 'inspection_id', 'inspections'),
+    ('notifications', 'inspection_id', 'inspections'),
+    ('violations', 'inspection_id', 'inspections'),
+    ('area_codes', 'area_id', 'areas'),
+    ('observations', 'area_id', 'areas'),
+    ('photos', 'observation_id', 'observations'),
+    ('citations', 'violation_id', 'violations'),
+    ('violation_codes', 'violation_id', 'violations'),
+    ('violation_comments', 'violation_id', 'violations'),
+    ('citations_codes', 'citation_id', 'citations'),
+    ('citation_comments', 'citation_id', 'citations'),
+]
+
+
+def _replace_foreign_key(table: str, column: str, referent: str, ondelete: Union[str, None]) -> None:
+    # Existing constraint names come from the Rails schema, so look them up instead of guessing
+    inspector = sa.inspect(op.get_bind())
+    for fk in inspector.get_foreign_keys(table):
+        if fk['constrained_columns'] == [column] and fk['referred_table'] == referent:
+            op.drop_constraint(fk['name'], table, type_='foreignkey')
+    op.create_foreign_key(f'fk_{table}_{column}', table, referent, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    for table, column, referent in CASCADE_FOREIGN_KEYS:
+        _replace_foreign_key(table, column, referent, 'CASCADE')
+
+
+def downgrade() -> None:
+    for table, column, referent in CASCADE_FOREIGN_KEYS:
+        _replace_foreign_key(table, column, referent, None)
@@ -0,0 +1,26 @@
+"""Index violations by address
+
+Revision ID: a1afb915f6fc
+Revises: 4dd755a1461b
+Create Date: 2026-10-17 15:02:47.980719
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1afb915f6fc'
+down_revision: Union[str, None] = '4dd755a1461b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_violations_address_id'), 'violations', ['address_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_violations_address_id'), table_name='violations')
@@ -0,0 +1,26 @@
+"""Index licenses for keyset pagination
+
+Revision ID: c94aaf705b08
+Revises: a1afb915f6fc
+Create Date: 2026-10-17 15:03:24.023579
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c94aaf705b08'
+down_revision: Union[str, None] = 'a1afb915f6fc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_licenses_created_id', 'licenses', [sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_licenses_created_id', table_name='licenses')
@@ -0,0 +1,53 @@
+"""Index foreign keys and the complaint list
+
+Revision ID: d496fc82586f
+Revises: 37a49563bf82
+Create Date: 2026-10-17 14:51:07.946906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd496fc82586f'
+down_revision: Union[str, None] = '37a49563bf82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) for every foreign key the cascading deletes and child lookups filter on
+FOREIGN_KEY_INDEXES = [
+    ('areas', 'inspection_id'),
+    ('area_codes', 'area_id'),
+    ('citations', 'violation_id'),
+    ('citation_comments', 'citation_id'),
+    ('inspection_codes', 'inspection_id'),
+    ('inspection_comments', 'inspection_id'),
+    ('licenses', 'inspection_id'),
+    ('notifications', 'inspection_id'),
+    ('observations', 'area_id'),
+    ('photos', 'observation_id'),
+    ('violation_codes', 'violation_id'),
+    ('violation_comments', 'violation_id'),
+    ('violations', 'inspection_id'),
+]
+
+
+def upgrade() -> None:
+    for table, column in FOREIGN_KEY_INDEXES:
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+    op.create_index(
+        'ix_inspections_complaints_created_id',
+        'inspections',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text("source = 'Complaint'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_inspections_complaints_created_id', table_name='inspections')
+    for table, column in FOREIGN_KEY_INDEXES:
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
@@ -0,0 +1,37 @@
+"""Add composite indexes for list filters
+
+Revision ID: edecb60d3de1
+Revises: 28e311db4a7c
+Create Date: 2026-10-17 14:55:45.905609
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'edecb60d3de1'
+down_revision: Union[str, None] = '28e311db4a7c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_inspections_address_id_source', 'inspections', ['address_id', 'source'], unique=False)
+    op.create_index('ix_areas_inspection_id_created_at', 'areas', ['inspection_id', sa.text('created_at DESC')], unique=False)
+    op.create_index(op.f('ix_prompts_room_id'), 'prompts', ['room_id'], unique=False)
+    op.create_index('ix_active_storage_attachments_record', 'active_storage_attachments', ['record_type', 'record_id', 'name'], unique=False)
+    # The composite index leads with inspection_id, so the single-column one becomes redundant
+    op.create_index('ix_inspection_comments_inspection_id_created_at', 'inspection_comments', ['inspection_id', sa.text('created_at DESC')], unique=False)
+    op.drop_index('ix_inspection_comments_inspection_id', table_name='inspection_comments')
+
+
+def downgrade() -> None:
+    op.create_index('ix_inspection_comments_inspection_id', 'inspection_comments', ['inspection_id'], unique=False)
+    op.drop_index('ix_inspection_comments_inspection_id_created_at', table_name='inspection_comments')
+    op.drop_index('ix_active_storage_attachments_record', table_name='active_storage_attachments')
+    op.drop_index(op.f('ix_prompts_room_id'), table_name='prompts')
+    op.drop_index('ix_areas_inspection_id_created_at', table_name='areas')
+    op.drop_index('ix_inspections_address_id_source', table_name='inspections')